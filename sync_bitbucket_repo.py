@@ -12,36 +12,147 @@
 # ------------------------------------------------------------------------------
 
 import argparse
+import concurrent.futures
+import configparser
+import json
 import os
+import shlex
+import shutil
 import subprocess
 import sys
+import tempfile
+from collections import deque
 from pathlib import Path
-from typing import Dict, Optional, cast
+from typing import Dict, Iterable, Iterator, Optional, Tuple, cast
+from urllib.parse import quote, urlsplit, urlunsplit
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter, Retry
+
+try:
+    # Optional: when available, clones/fetches run in-process through libgit2
+    # instead of forking a git subprocess per repository.
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+try:
+    # Optional: when available, listing pages are decoded incrementally from
+    # the response stream instead of materializing the whole page as dicts.
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    # Optional: considerably faster JSON decoding of large listing responses.
+    import orjson
+except ImportError:
+    orjson = None
+
+_GIT_ERRORS = (pygit2.GitError,) if pygit2 else ()
+
+# Passed inline on every clone/fetch: let git use all cores for packfile
+# indexing and delta resolution, and auto-parallelize ref fetching.
+_GIT_THREAD_OPTS = [
+    "-c",
+    "pack.threads=0",
+    "-c",
+    "index.threads=0",
+    "-c",
+    "fetch.parallel=0",
+]
 
 # Constants
 BITBUCKET_API_URL = "https://api.bitbucket.org/2.0"
 
+# A single session keeps the TCP+TLS connection alive across the pagination
+# loop instead of paying a fresh handshake per page.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)
+        ),
+    ),
+)
+
+
+def _decode_json(response: requests.Response):
+    """
+    Decodes a response body with orjson when available (markedly faster on
+    large listing pages), falling back to response.json().
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _load_state(folder: Path) -> dict:
+    """
+    Loads the sync state (listing ETag and per-repo updated_on timestamps)
+    from state.json in the target folder. Returns an empty dict if the file
+    is missing or unreadable.
+    """
+    try:
+        with open(folder / "state.json") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(folder: Path, state: dict) -> None:
+    """Writes the sync state to state.json atomically via os.replace."""
+    path = folder / "state.json"
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _iter_page_values(response: requests.Response) -> Iterator[dict]:
+    """
+    Yields the repo entries of a listing page. When ijson is installed the
+    values array is decoded incrementally from the response stream, avoiding
+    a full in-memory parse of the page; otherwise falls back to response.json().
+    """
+    if ijson is not None:
+        response.raw.decode_content = True
+        yield from ijson.items(response.raw, "values.item")
+    else:
+        yield from _decode_json(response).get("values", [])
+
 
 def list_bitbucket_repos(
     workspace: str,
     token: Optional[str] = None,
     user: Optional[str] = None,
     ssh: bool = False,
-) -> Optional[Dict[str, str]]:
+    state: Optional[dict] = None,
+    name_filter: Optional[str] = None,
+) -> Optional[Dict[str, Tuple[str, Optional[str], int]]]:
     """
     Lists all repositories for a given Bitbucket workspace.
 
+    Sends a conditional request (If-None-Match / If-Modified-Since) using the
+    cached listing validators from the state; on 304 Not Modified the cached
+    repo list is returned without re-downloading any pages.
+
     Args:
         workspace (str): The Bitbucket workspace (username or team name).
         token (str, optional): An Atlassian API token.
         user (str, optional): Your Atlassian account email (for API token auth).
         ssh (bool): If True, retrieve SSH clone URLs instead of HTTPS.
+        state (dict, optional): Sync state from a previous run; updated in place.
+        name_filter (str, optional): Only list repos whose name contains this
+            substring (server-side q= filter).
 
     Returns:
-        A dictionary containing repo name and clone url, or None on failure.
+        A dictionary mapping repo name to (clone url, updated_on, size in
+        bytes), or None on failure.
     """
     headers = {}
     auth = None
@@ -51,69 +162,554 @@ def list_bitbucket_repos(
         # This case might be for OAuth tokens, but Atlassian API tokens are recommended
         headers["Authorization"] = f"Bearer {token}"
 
+    # pagelen=100 is the API maximum (default 10), and the fields= projection
+    # asks the server for only the fields we read, shrinking each page's payload.
     url = f"{BITBUCKET_API_URL}/repositories/{workspace}"
+    params = {
+        "pagelen": 100,
+        "fields": "next,size,values.name,values.size,"
+        "values.links.clone.href,values.links.clone.name,values.updated_on",
+    }
+    if name_filter:
+        # Server-side filter: the API never sends rows we would discard.
+        params["q"] = f'name~"{name_filter}"'
     print(f"\nListing repositories for workspace '{workspace}'...")
 
     clone_type = "ssh" if ssh else "https"
-    repo_dict = {}
-    while url:
-        try:
-            response = requests.get(url, headers=headers, auth=auth)
-            response.raise_for_status()
+    cached_listing = state.get("listing", {}) if state else {}
+    repo_dict: Dict[str, Tuple[str, Optional[str], int]] = {}
+
+    def _collect_values(values: Iterable[dict]) -> None:
+        for repo in values:
+            repo_name = repo["name"]
+            clone_url = ""
+            for clone_link in repo.get("links", {}).get("clone", []):
+                if clone_link.get("name") == clone_type:
+                    clone_url = clone_link.get("href")
+                    break
+            if clone_url:
+                repo_dict[repo_name] = (
+                    clone_url,
+                    repo.get("updated_on"),
+                    repo.get("size") or 0,
+                )
+            else:
+                print(
+                    f"  Warning: No {clone_type} clone URL found for '{repo_name}'.",
+                    file=sys.stderr,
+                )
+
+    try:
+        page_headers = headers
+        if cached_listing:
+            page_headers = dict(headers)
+            if cached_listing.get("etag"):
+                page_headers["If-None-Match"] = cached_listing["etag"]
+            if cached_listing.get("last_modified"):
+                page_headers["If-Modified-Since"] = cached_listing["last_modified"]
+
+        response = _SESSION.get(
+            url, params={**params, "page": 1}, headers=page_headers, auth=auth
+        )
 
-            data = response.json()
-            for repo in data.get("values", []):
-                repo_name = repo["name"]
+        if response.status_code == 304:
+            print("Listing unchanged since last sync (304). Using cached repo list.")
+            return {
+                name: (entry["clone_url"], entry.get("updated_on"), entry.get("size", 0))
+                for name, entry in (state or {}).get("repos", {}).items()
+            }
+
+        response.raise_for_status()
+
+        data = _decode_json(response)
+        _collect_values(data.get("values", []))
+
+        # size is the total repo count, so the number of pages is known after
+        # the first response and the rest can be fetched concurrently.
+        total_pages = 1
+        if data.get("size") is not None:
+            total_pages = -(-data["size"] // 100)
+
+        # The ETag covers page 1's body only: a change anywhere on a later
+        # page can leave page 1 byte-identical and still earn a 304. Only
+        # keep validators (and thus the 304 short-circuit) when the whole
+        # listing fits in a single page.
+        if state is not None:
+            if total_pages > 1 or data.get("next"):
+                state.pop("listing", None)
+            else:
+                state["listing"] = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+
+        if total_pages > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+                page_futures = [
+                    executor.submit(
+                        _SESSION.get,
+                        url,
+                        params={**params, "page": p},
+                        headers=headers,
+                        auth=auth,
+                        stream=True,
+                    )
+                    for p in range(2, total_pages + 1)
+                ]
+                for page_future in concurrent.futures.as_completed(page_futures):
+                    page_response = page_future.result()
+                    page_response.raise_for_status()
+                    # Pages past the first only need values, so they can be
+                    # decoded straight off the stream.
+                    with page_response:
+                        _collect_values(_iter_page_values(page_response))
+        else:
+            # Fall back to following the next links serially if the total
+            # count was not reported.
+            next_url = data.get("next")
+            while next_url:
+                response = _SESSION.get(next_url, headers=headers, auth=auth)
+                response.raise_for_status()
+                data = _decode_json(response)
+                _collect_values(data.get("values", []))
+                next_url = data.get("next")
+
+    except requests.exceptions.HTTPError as e:
+        print(f"Error: Failed to retrieve repositories: {e}", file=sys.stderr)
+        if e.response is not None:
+            if e.response.status_code in [401, 403]:
+                print(
+                    "  Authentication failed. Please check your credentials.",
+                    file=sys.stderr,
+                )
+                print(
+                    "  - Verify your BB_USER (Atlassian email) and BB_TOKEN (Atlassian API token).",
+                    file=sys.stderr,
+                )
+            print(f"  Response: {e.response.text}", file=sys.stderr)
+        return None
+    except requests.exceptions.RequestException as e:
+        print(f"Error: A network error occurred: {e}", file=sys.stderr)
+        return None
+    return repo_dict
+
+
+def list_selected_bitbucket_repos(
+    names: list,
+    workspace: str,
+    token: Optional[str] = None,
+    user: Optional[str] = None,
+    ssh: bool = False,
+) -> Dict[str, Tuple[str, Optional[str], int]]:
+    """
+    Fetches metadata for an explicit list of repositories, skipping the full
+    workspace enumeration: one small GET per requested repo slug (issued in
+    parallel) instead of paging through the whole workspace.
+
+    Args:
+        names (list): The repository slugs to look up.
+        workspace (str): The Bitbucket workspace (username or team name).
+        token (str, optional): An Atlassian API token.
+        user (str, optional): Your Atlassian account email (for API token auth).
+        ssh (bool): If True, retrieve SSH clone URLs instead of HTTPS.
+
+    Returns:
+        A dictionary mapping repo name to (clone url, updated_on, size in bytes).
+    """
+    headers = {}
+    auth = None
+    if user and token:
+        auth = (user, token)
+    elif token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    clone_type = "ssh" if ssh else "https"
+    params = {"fields": "name,size,links.clone.href,links.clone.name,updated_on"}
+    repo_dict: Dict[str, Tuple[str, Optional[str], int]] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            executor.submit(
+                _SESSION.get,
+                f"{BITBUCKET_API_URL}/repositories/{workspace}/{name}",
+                params=params,
+                headers=headers,
+                auth=auth,
+            ): name
+            for name in names
+        }
+        for future in concurrent.futures.as_completed(futures):
+            name = futures[future]
+            try:
+                response = future.result()
+                response.raise_for_status()
+                repo = _decode_json(response)
                 clone_url = ""
                 for clone_link in repo.get("links", {}).get("clone", []):
                     if clone_link.get("name") == clone_type:
                         clone_url = clone_link.get("href")
                         break
                 if clone_url:
-                    repo_dict[repo_name] = clone_url
+                    repo_dict[repo["name"]] = (
+                        clone_url,
+                        repo.get("updated_on"),
+                        repo.get("size") or 0,
+                    )
                 else:
                     print(
-                        f"  Warning: No {clone_type} clone URL found for '{repo_name}'.",
+                        f"  Warning: No {clone_type} clone URL found for '{name}'.",
                         file=sys.stderr,
                     )
+            except requests.exceptions.RequestException as e:
+                print(
+                    f"Error: Failed to retrieve repository '{name}': {e}",
+                    file=sys.stderr,
+                )
+    return repo_dict
 
-            url = data.get("next")  # Get the URL for the next page
 
-        except requests.exceptions.HTTPError as e:
-            print(f"Error: Failed to retrieve repositories: {e}", file=sys.stderr)
-            if e.response is not None:
-                if e.response.status_code in [401, 403]:
-                    print(
-                        "  Authentication failed. Please check your credentials.",
-                        file=sys.stderr,
-                    )
-                    print(
-                        "  - Verify your BB_USER (Atlassian email) and BB_TOKEN (Atlassian API token).",
-                        file=sys.stderr,
-                    )
-                print(f"  Response: {e.response.text}", file=sys.stderr)
-            return None
-        except requests.exceptions.RequestException as e:
-            print(f"Error: A network error occurred: {e}", file=sys.stderr)
+# Headroom required on the staging filesystem before we clone into it.
+_STAGING_MIN_FREE_BYTES = 256 * 1024 * 1024
+
+
+# How many trailing stderr lines to keep for error reporting.
+_STDERR_TAIL_LINES = 50
+
+
+def _remote_refs_unchanged(repo_path: Path, clone_url: str) -> bool:
+    """
+    Returns True when every ref the remote advertises (branches, tags and
+    anything else under refs/) matches the local mirror's, i.e. a fetch
+    would be a no-op. Any failure (offline, empty repo) returns False so
+    the caller falls through to a normal fetch.
+    """
+    try:
+        out = subprocess.check_output(
+            ["git", "ls-remote", "origin"],
+            cwd=repo_path,
+            env=_git_env(clone_url),
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        remote_refs = {}
+        for line in out.splitlines():
+            sha, _, ref = line.partition("\t")
+            # Skip the symbolic HEAD and peeled tag entries (ref^{}): the
+            # mirror stores neither as a ref of its own.
+            if not ref or ref == "HEAD" or ref.endswith("^{}"):
+                continue
+            remote_refs[ref] = sha
+        local_out = subprocess.check_output(
+            ["git", "for-each-ref", "--format=%(objectname) %(refname)"],
+            cwd=repo_path,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        local_refs = {}
+        for line in local_out.splitlines():
+            sha, _, ref = line.partition(" ")
+            if ref:
+                local_refs[ref] = sha
+    except subprocess.CalledProcessError:
+        return False
+    return bool(remote_refs) and remote_refs == local_refs
+
+
+def _git_env(clone_url: str) -> Optional[dict]:
+    """
+    Returns the environment for git subprocesses handling the given URL.
+    For SSH clone URLs on POSIX systems, enables OpenSSH connection
+    multiplexing (ControlMaster) so every repo after the first reuses a
+    single SSH session per host instead of paying a handshake each.
+    Returns None (inherit the environment) for HTTPS URLs and on Windows,
+    where control sockets are unsupported.
+    """
+    if os.name == "nt" or clone_url.startswith("https://"):
+        return None
+    control_path = Path(tempfile.gettempdir()) / "sync-%C"
+    env = os.environ.copy()
+    env["GIT_SSH_COMMAND"] = (
+        "ssh -o ControlMaster=auto "
+        f"-o ControlPath={shlex.quote(str(control_path))} "
+        "-o ControlPersist=60s"
+    )
+    return env
+
+
+def _run_git(
+    cmd: list, cwd: Optional[Path] = None, env: Optional[dict] = None
+) -> None:
+    """
+    Runs a git command, streaming its stderr instead of buffering it all:
+    progress output is discarded as it arrives and only a bounded tail is
+    retained for error reporting, so memory stays flat even when cloning
+    huge repositories.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    tail: deque = deque(maxlen=_STDERR_TAIL_LINES)
+    assert proc.stderr is not None
+    for line in proc.stderr:
+        tail.append(line)
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr="".join(tail))
+
+
+def _with_credentials(clone_url: str, userinfo: str) -> str:
+    """
+    Prefixes the URL's netloc with the precomputed (already URL-quoted)
+    userinfo. Non-HTTPS URLs are returned unchanged.
+    """
+    if not userinfo or not clone_url.startswith("https://"):
+        return clone_url
+    parts = urlsplit(clone_url)
+    return urlunsplit(parts._replace(netloc=userinfo + parts.netloc))
+
+
+def _remote_origin_url(repo_path: Path) -> Optional[str]:
+    """
+    Reads remote.origin.url straight from the bare repository's config file,
+    avoiding a git subprocess. Git's config is INI-like but indents its keys,
+    so lines are dedented before parsing; interpolation is disabled because
+    stored URLs routinely contain % escapes from quoted credentials. Returns
+    None if the file is missing or unparsable.
+    """
+    cfg = configparser.ConfigParser(strict=False, interpolation=None)
+    try:
+        with open(repo_path / "config") as f:
+            cfg.read_string("\n".join(line.strip() for line in f))
+        return cfg.get('remote "origin"', "url", fallback=None)
+    except (OSError, configparser.Error):
+        return None
+
+
+def _staging_path(repo_name: str, staging_dir: str) -> Optional[Path]:
+    """
+    Returns a path under the staging directory to clone into, or None if the
+    staging filesystem is unusable or low on space. Staging on a RAM disk
+    (e.g. /dev/shm) avoids fsync stalls on the destination filesystem while
+    git writes and resolves the packfile.
+    """
+    stage_root = Path(staging_dir)
+    try:
+        stage_root.mkdir(parents=True, exist_ok=True)
+        if shutil.disk_usage(stage_root).free < _STAGING_MIN_FREE_BYTES:
             return None
-    return repo_dict
+    except OSError:
+        return None
+    return stage_root / f"{repo_name}.git"
+
+
+def _mirror_remote(repo, name, url):
+    """
+    Remote-creation callback for pygit2.clone_repository: creates origin with
+    a mirror refspec so the initial fetch already transfers every ref, like
+    `git clone --mirror`, instead of a heads-only snapshot that only becomes
+    a full mirror on the next fetch.
+    """
+    return repo.remotes.create(name, url, "+refs/*:refs/*")
+
+
+def _sync_one_pygit2(
+    repo_name: str,
+    clone_url: str,
+    repo_path: Path,
+    token: Optional[str],
+    user: Optional[str],
+    staging_dir: Optional[str] = None,
+) -> str:
+    """
+    In-process variant of _sync_one using libgit2 via pygit2. Avoids the
+    fork+exec and process startup cost of a git subprocess per repository.
+
+    Args:
+        repo_name (str): The repository name.
+        clone_url (str): The repository clone URL (without embedded credentials).
+        repo_path (Path): The local path of the bare repository.
+        token (str, optional): An Atlassian API token.
+        user (str, optional): Your Atlassian account email (for API token auth).
+
+    Returns:
+        str: A status message describing what was done.
+    """
+    callbacks = None
+    if user and token:
+        callbacks = pygit2.RemoteCallbacks(credentials=pygit2.UserPass(user, token))
+
+    if repo_path.exists():
+        repo = pygit2.Repository(str(repo_path))
+        if repo.remotes["origin"].url != clone_url:
+            repo.remotes.set_url("origin", clone_url)
+        repo.remotes["origin"].fetch(
+            refspecs=["+refs/*:refs/*"],
+            callbacks=callbacks,
+            prune=pygit2.GIT_FETCH_PRUNE,
+        )
+        return f"Fetched updates for '{repo_name}'."
+    else:
+        dest = repo_path
+        if staging_dir:
+            dest = _staging_path(repo_name, staging_dir) or repo_path
+        try:
+            repo = pygit2.clone_repository(
+                clone_url,
+                str(dest),
+                bare=True,
+                remote=_mirror_remote,
+                callbacks=callbacks,
+            )
+            # Match `git clone --mirror` for future fetches too.
+            repo.config["remote.origin.mirror"] = True
+            repo.config["remote.origin.fetch"] = "+refs/*:refs/*"
+        except Exception:
+            if dest != repo_path:
+                shutil.rmtree(dest, ignore_errors=True)
+            raise
+        if dest != repo_path:
+            shutil.move(str(dest), str(repo_path))
+        return f"Mirror cloned '{repo_name}' into '{repo_path}'."
+
+
+def _sync_one(
+    repo_name: str,
+    clone_url: str,
+    base_path: Path,
+    token: Optional[str],
+    user: Optional[str],
+    userinfo: str = "",
+    partial: bool = False,
+    staging_dir: Optional[str] = None,
+) -> Tuple[str, bool]:
+    """
+    Mirror clones a single repository, or fetches updates if it already exists.
+    Uses libgit2 in-process when pygit2 is installed; otherwise falls back to
+    git subprocesses. Git output is captured so that concurrent workers do not
+    interleave on the terminal.
+
+    Args:
+        repo_name (str): The repository name.
+        clone_url (str): The repository clone URL.
+        base_path (Path): The local folder to save the repository.
+        token (str, optional): An Atlassian API token.
+        user (str, optional): Your Atlassian account email (for API token auth).
+        userinfo (str): Pre-quoted "user:token@" prefix to inject into HTTPS
+            URLs.
+        partial (bool): If True, clone with --filter=blob:none so historical
+            blobs are fetched on demand instead of up front.
+        staging_dir (str, optional): Stage first-time clones here (e.g. a
+            tmpfs path) and move them into place on success.
+
+    Returns:
+        tuple: A status message and whether the repository was actually
+        cloned/fetched (False when the heads pre-check skipped the fetch).
+    """
+    repo_path = base_path / f"{repo_name}.git"
+
+    # Partial clones need the git CLI (libgit2 has no promisor support), and
+    # so do SSH URLs: the pygit2 path only carries HTTPS credentials, and the
+    # ControlMaster multiplexing in _git_env covers subprocesses only.
+    if pygit2 is not None and not partial and clone_url.startswith("https://"):
+        return (
+            _sync_one_pygit2(repo_name, clone_url, repo_path, token, user, staging_dir),
+            True,
+        )
+
+    clone_url = _with_credentials(clone_url, userinfo)
+
+    if repo_path.exists():
+        # Check if the remote URL needs to be updated with credentials;
+        # only spawn git when it actually needs changing.
+        remote_url = _remote_origin_url(repo_path)
+        if remote_url != clone_url:
+            try:
+                subprocess.run(
+                    ["git", "remote", "set-url", "origin", clone_url],
+                    cwd=repo_path,
+                    check=True,
+                    capture_output=True,
+                )
+            except subprocess.CalledProcessError as e:
+                print(
+                    f"  Warning: Failed to update remote URL for '{repo_name}'.\n  {e.stderr}",
+                    file=sys.stderr,
+                )
+        # Cheap pre-check: a single ls-remote round-trip (refs only, no
+        # packfile) instead of a full fetch negotiation when no advertised
+        # ref has moved. The skip is still reported as not-fetched so the
+        # fresh updated_on is never cached for a run that didn't fetch, and
+        # the pre-check simply runs again next time.
+        if _remote_refs_unchanged(repo_path, clone_url):
+            return f"'{repo_name}' already up to date (remote refs unchanged).", False
+
+        # Fetch only origin instead of --all, and advertise just our branch
+        # tips during negotiation so the server computes a minimal delta.
+        fetch_cmd = [
+            "git",
+            *_GIT_THREAD_OPTS,
+            "fetch",
+            "--prune",
+            "--negotiation-tip=refs/heads/*",
+        ]
+        if partial:
+            fetch_cmd.append("--filter=blob:none")
+        fetch_cmd.append("origin")
+        _run_git(fetch_cmd, cwd=repo_path, env=_git_env(clone_url))
+        return f"Fetched updates for '{repo_name}'.", True
+    else:
+        dest = repo_path
+        if staging_dir:
+            dest = _staging_path(repo_name, staging_dir) or repo_path
+        clone_cmd = ["git", *_GIT_THREAD_OPTS, "clone", "--mirror"]
+        if partial:
+            # git records remote.origin.promisor/partialclonefilter itself,
+            # so later fetches stay partial without extra configuration.
+            clone_cmd.append("--filter=blob:none")
+        clone_cmd += [clone_url, str(dest)]
+        try:
+            _run_git(clone_cmd, env=_git_env(clone_url))
+        except subprocess.CalledProcessError:
+            if dest != repo_path:
+                shutil.rmtree(dest, ignore_errors=True)
+            raise
+        if dest != repo_path:
+            shutil.move(str(dest), str(repo_path))
+        return f"Mirror cloned '{repo_name}' into '{repo_path}'.", True
 
 
 def mirror_repos(
-    repos: Dict[str, str],
+    repos: Dict[str, Tuple[str, Optional[str], int]],
     folder: str,
     token: Optional[str] = None,
     user: Optional[str] = None,
+    jobs: int = 1,
+    state: Optional[dict] = None,
+    partial: bool = False,
+    staging_dir: Optional[str] = None,
 ) -> None:
     """
     Mirror clones the given repositories into the specified folder.
-    If the repository already exists, it fetches all the changes.
+    If the repository already exists, it fetches all the changes, unless its
+    updated_on timestamp matches the cached one from the previous run, in
+    which case the fetch is skipped entirely.
+    Repositories are processed concurrently by a thread pool, since the
+    per-repo work is almost entirely network/disk bound inside git.
 
     Args:
-        repos (dict): A dictionary of repository names and their clone URLs.
+        repos (dict): A dictionary mapping repo name to (clone url, updated_on,
+            size in bytes).
         folder (str): The local folder to save the repositories.
         token (str, optional): An Atlassian API token.
         user (str, optional): Your Atlassian account email (for API token auth).
+        jobs (int): The number of repositories to process in parallel.
+        state (dict, optional): Sync state from a previous run; updated in place.
+        partial (bool): If True, new clones use --filter=blob:none.
+        staging_dir (str, optional): Stage first-time clones here (e.g. a
+            tmpfs path) and move them into place on success.
     """
     base_path = Path(folder)
     try:
@@ -122,74 +718,85 @@ def mirror_repos(
         print(f"Error: Could not create directory {base_path}: {e}", file=sys.stderr)
         sys.exit(1)
 
-    for repo_name, clone_url in repos.items():
-        print(f"\nProcessing '{repo_name}'...")
-        repo_path = base_path / f"{repo_name}.git"
+    cached_repos = state.get("repos", {}) if state else {}
 
-        if clone_url.startswith("https://"):
-            if user and token:
-                # Atlassian API token authentication
-                clone_url = clone_url.replace("https://", f"https://{user}:{token}@")
-
-        try:
-            if repo_path.exists():
+    # Quote the credentials once up front; Atlassian emails contain '@',
+    # which would otherwise corrupt the URL's netloc and fail auth.
+    userinfo = ""
+    if user and token:
+        userinfo = f"{quote(user, safe='')}:{quote(token, safe='')}@"
+
+    # Submit largest repositories first (longest-processing-time-first):
+    # total wall time is bounded by when the biggest clone starts, so it must
+    # not end up queued behind a batch of small ones.
+    ordered = sorted(repos.items(), key=lambda item: item[1][2], reverse=True)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        for repo_name, (clone_url, updated_on, _size) in ordered:
+            repo_path = base_path / f"{repo_name}.git"
+            if (
+                updated_on
+                and repo_path.exists()
+                and cached_repos.get(repo_name, {}).get("updated_on") == updated_on
+            ):
+                print(f"\n'{repo_name}' unchanged since last sync. Skipping.")
+                continue
+            futures[
+                executor.submit(
+                    _sync_one,
+                    repo_name,
+                    clone_url,
+                    base_path,
+                    token,
+                    user,
+                    userinfo,
+                    partial,
+                    staging_dir,
+                )
+            ] = repo_name
+        failures = 0
+        for future in concurrent.futures.as_completed(futures):
+            repo_name = futures[future]
+            try:
+                message, fetched = future.result()
+                print(f"\n{message}")
+                # Only a real clone/fetch earns the fresh timestamp: a
+                # skipped repo stays retryable instead of being recorded
+                # as synced.
+                if state is not None and fetched:
+                    clone_url, updated_on, size = repos[repo_name]
+                    state.setdefault("repos", {})[repo_name] = {
+                        "clone_url": clone_url,
+                        "updated_on": updated_on,
+                        "size": size,
+                    }
+            except FileNotFoundError:
                 print(
-                    f"Repository already exists. Fetching updates for '{repo_name}'..."
+                    "Error: 'git' command not found. Is Git installed and in your PATH?",
+                    file=sys.stderr,
                 )
-                # Check if the remote URL needs to be updated with credentials
-                try:
-                    result = subprocess.run(
-                        ["git", "config", "--get", "remote.origin.url"],
-                        cwd=repo_path,
-                        text=True,
-                        capture_output=True,
-                        check=True,
-                    )
-                    remote_url = result.stdout.strip()
-                    if remote_url != clone_url:
-                        print("Updating remote URL with credentials.")
-                        subprocess.run(
-                            ["git", "remote", "set-url", "origin", clone_url],
-                            cwd=repo_path,
-                            check=True,
-                            capture_output=True,
-                        )
-                except subprocess.CalledProcessError as e:
-                    print(
-                        f"  Warning: Failed to check or update remote URL for '{repo_name}'.\n  {e.stderr}",
-                        file=sys.stderr,
-                    )
-                subprocess.run(
-                    ["git", "fetch", "--all", "--prune", "--progress"],
-                    cwd=repo_path,
-                    check=True,
+                sys.exit(1)
+            except subprocess.CalledProcessError as e:
+                failures += 1
+                print(
+                    f"  Error: Failed to process repository '{repo_name}'. Git command failed.",
+                    file=sys.stderr,
                 )
-            else:
-                print(f"Mirror cloning '{repo_name}' into '{repo_path}'...")
-                subprocess.run(
-                    [
-                        "git",
-                        "clone",
-                        "--mirror",
-                        "--progress",
-                        clone_url,
-                        str(repo_path),
-                    ],
-                    check=True,
+                if e.stderr:
+                    print(f"  {e.stderr.strip()}", file=sys.stderr)
+            except _GIT_ERRORS as e:
+                failures += 1
+                print(
+                    f"  Error: Failed to process repository '{repo_name}': {e}",
+                    file=sys.stderr,
                 )
-        except FileNotFoundError:
-            print(
-                "Error: 'git' command not found. Is Git installed and in your PATH?",
-                file=sys.stderr,
-            )
-            sys.exit(1)
-        except subprocess.CalledProcessError as e:
-            print(
-                f"  Error: Failed to process repository '{repo_name}'. Git command failed.",
-                file=sys.stderr,
-            )
-            if e.stderr:
-                print(f"  {e.stderr.strip()}", file=sys.stderr)
+
+    if failures and state is not None:
+        # A failed repo never makes it into state["repos"], and a 304 on the
+        # next run would serve the cached list without it. Drop the listing
+        # validators so the next run re-enumerates and retries.
+        state.pop("listing", None)
 
 
 def main() -> None:
@@ -233,6 +840,40 @@ def main() -> None:
         action="store_true",
         help="Do not use SSH clone URLs. Overrides BB_USE_SSH from .env.",
     )
+    parser.add_argument(
+        "--jobs",
+        default=min(8, (os.cpu_count() or 1) * 2),
+        help="Number of repositories to clone/fetch in parallel.",
+        type=int,
+    )
+    parser.add_argument(
+        "--name-filter",
+        default=None,
+        help="Only sync repositories whose name contains this substring.",
+        type=str,
+    )
+    parser.add_argument(
+        "--partial",
+        action="store_true",
+        help="Clone with --filter=blob:none (blobs fetched on demand). Note that commands like 'git log -p' in the mirror will trigger on-demand blob fetches.",
+    )
+    parser.add_argument(
+        "--staging-dir",
+        default=None,
+        help="Stage first-time clones in this directory (e.g. /dev/shm/bbsync) and move them into the target folder on success.",
+        type=str,
+    )
+    parser.add_argument(
+        "--prune-deleted",
+        action="store_true",
+        help="Remove local mirrors of repositories that no longer exist upstream.",
+    )
+    parser.add_argument(
+        "--repos",
+        default=None,
+        help="Comma-separated repository slugs to sync, skipping the full workspace listing.",
+        type=str,
+    )
 
     args = parser.parse_args()
 
@@ -253,7 +894,20 @@ def main() -> None:
             "Workspace must be provided via --workspace or BB_WORKSPACE in .env file"
         )
 
-    repos = list_bitbucket_repos(args.workspace, args.token, args.user, ssh_flag)
+    target_folder = str(
+        Path(args.folder) / cast(str, f"{args.folder}_{args.workspace}")
+    )
+
+    state = _load_state(Path(target_folder))
+    if args.repos:
+        names = [name.strip() for name in args.repos.split(",") if name.strip()]
+        repos = list_selected_bitbucket_repos(
+            names, args.workspace, args.token, args.user, ssh_flag
+        )
+    else:
+        repos = list_bitbucket_repos(
+            args.workspace, args.token, args.user, ssh_flag, state, args.name_filter
+        )
 
     if repos is None:
         sys.exit(1)
@@ -262,14 +916,50 @@ def main() -> None:
         print("No repositories found to mirror.")
         return
 
-    target_folder = str(
-        Path(args.folder) / cast(str, f"{args.folder}_{args.workspace}")
-    )
+    # Reconcile against the previous run: anything in the state but absent
+    # from the fresh listing was deleted (or renamed) upstream. Only a full
+    # listing may drive deletions: a --repos or --name-filter subset lists
+    # less than the state may hold, and so does an unauthenticated run
+    # (public repos only) against a state populated with credentials —
+    # hence the recorded scope must match too.
+    scope = {"workspace": args.workspace, "authenticated": bool(args.token)}
+    full_listing = not (args.repos or args.name_filter)
+    if full_listing and state.get("scope") == scope:
+        deleted = set(state.get("repos", {})) - set(repos)
+    else:
+        deleted = set()
+    if full_listing:
+        state["scope"] = scope
+    if deleted:
+        if args.prune_deleted:
+            for repo_name in sorted(deleted):
+                shutil.rmtree(
+                    Path(target_folder) / f"{repo_name}.git", ignore_errors=True
+                )
+                state["repos"].pop(repo_name, None)
+                print(f"Pruned deleted repository '{repo_name}'.")
+            _save_state(Path(target_folder), state)
+        else:
+            print(
+                f"{len(deleted)} mirrored repositories no longer exist upstream "
+                "(re-run with --prune-deleted to remove them): "
+                + ", ".join(sorted(deleted))
+            )
 
     print(f"\nFound {len(repos)} repositories to sync.")
     print(f"Target directory: {target_folder}")
 
-    mirror_repos(repos, target_folder, args.token, args.user)
+    mirror_repos(
+        repos,
+        target_folder,
+        args.token,
+        args.user,
+        args.jobs,
+        state,
+        args.partial,
+        args.staging_dir,
+    )
+    _save_state(Path(target_folder), state)
     print("\nSync complete.")
 
 
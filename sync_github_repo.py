@@ -12,12 +12,93 @@
 # ------------------------------------------------------------------------------
 
 import argparse
+import concurrent.futures
+import configparser
+import json
 import os
+import shlex
+import shutil
 import subprocess
-from typing import Dict, Optional
+import tempfile
+from collections import deque
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlsplit, urlunsplit
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter, Retry
+
+try:
+    # Optional: when available, clones/fetches run in-process through libgit2
+    # instead of forking a git subprocess per repository.
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+try:
+    # Optional: considerably faster JSON decoding of large listing responses.
+    import orjson
+except ImportError:
+    orjson = None
+
+_GIT_ERRORS = (pygit2.GitError,) if pygit2 else ()
+
+# Passed inline on every clone/fetch: let git use all cores for packfile
+# indexing and delta resolution, and auto-parallelize ref fetching.
+_GIT_THREAD_OPTS = [
+    "-c",
+    "pack.threads=0",
+    "-c",
+    "index.threads=0",
+    "-c",
+    "fetch.parallel=0",
+]
+
+# A single session keeps the TCP+TLS connection alive across the pagination
+# loop instead of paying a fresh handshake per page.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)
+        ),
+    ),
+)
+
+
+def _decode_json(response: requests.Response):
+    """
+    Decodes a response body with orjson when available (markedly faster on
+    large listing pages), falling back to response.json().
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _load_state(folder: str) -> dict:
+    """
+    Loads the sync state (listing ETag and per-repo pushed_at timestamps)
+    from state.json in the target folder. Returns an empty dict if the file
+    is missing or unreadable.
+    """
+    try:
+        with open(os.path.join(folder, "state.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(folder: str, state: dict) -> None:
+    """Writes the sync state to state.json atomically via os.replace."""
+    path = os.path.join(folder, "state.json")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
 
 
 def list_repos(
@@ -25,127 +106,669 @@ def list_repos(
     repo_type: str,
     token: Optional[str] = None,
     org_name: Optional[str] = None,
-) -> Dict[str, str]:
+    state: Optional[dict] = None,
+) -> Optional[Dict[str, Tuple[str, Optional[str], int]]]:
     """
     Lists all repositories for a given GitHub individual user or organization.
 
+    Sends a conditional request (If-None-Match / If-Modified-Since) using the
+    cached listing validators from the state; on 304 Not Modified the cached
+    repo list is returned without re-downloading any pages.
+
     Args:
         username (str): The GitHub username.
         repo_type (str): The type of repositories to list (public, private, all).
         token (str, optional): The GitHub personal access token. Defaults to None.
         org_name (str, optional): The GitHub organization name. Defaults to None.
+        state (dict, optional): Sync state from a previous run; updated in place.
 
     Returns:
-        dict: A dictionary containing repo name and clone url.
+        dict: A dictionary mapping repo name to (clone url, pushed_at, size in
+        KB), or None on failure. A partial listing is never returned: callers
+        reconcile deletions against the result, so an incomplete dict would
+        misreport live repos as gone.
     """
     headers = {}
     if token:
         headers["Authorization"] = f"token {token}"
     headers["Accept"] = "application/vnd.github.v3+json"
 
+    cached_listing = state.get("listing", {}) if state else {}
+
     if org_name:
-        url = f"https://api.github.com/orgs/{org_name}/repos?type={repo_type}"
+        url = f"https://api.github.com/orgs/{org_name}/repos"
         print(f"\n{repo_type.capitalize()} repositories for organization '{org_name}':")
     else:
         if token:
-            url = f"https://api.github.com/user/repos?type={repo_type}"
+            url = "https://api.github.com/user/repos"
         else:
-            url = f"https://api.github.com/users/{username}/repos?type={repo_type}"
+            url = f"https://api.github.com/users/{username}/repos"
         print(f"\n{repo_type.capitalize()} repositories for user '{username}':")
 
-    page = 1
-    repo_dict = {}
+    # per_page=100 is the API maximum (default 30); fewer pages means fewer
+    # round-trips and less rate-limit consumption.
+    params = {"type": repo_type, "per_page": 100}
+
+    repo_dict: Dict[str, Tuple[str, Optional[str], int]] = {}
+    try:
+        page_headers = headers
+        if cached_listing:
+            page_headers = dict(headers)
+            if cached_listing.get("etag"):
+                page_headers["If-None-Match"] = cached_listing["etag"]
+            if cached_listing.get("last_modified"):
+                page_headers["If-Modified-Since"] = cached_listing["last_modified"]
+
+        response = _SESSION.get(url, params={**params, "page": 1}, headers=page_headers)
+
+        if response.status_code == 304:
+            print("Listing unchanged since last sync (304). Using cached repo list.")
+            return {
+                name: (entry["clone_url"], entry.get("pushed_at"), entry.get("size", 0))
+                for name, entry in (state or {}).get("repos", {}).items()
+            }
+
+        response.raise_for_status()  # Raises an HTTPError for bad responses (4xx or 5xx)
+
+        # GitHub's ETag covers page 1's body only: a change anywhere on a
+        # later page can leave page 1 byte-identical and still earn a 304.
+        # Only keep validators (and thus the 304 short-circuit) when the
+        # whole listing fits in a single page.
+        if state is not None:
+            if "last" in response.links:
+                state.pop("listing", None)
+            else:
+                state["listing"] = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+
+        for repo in _decode_json(response):
+            repo_dict[repo["name"]] = (
+                repo["clone_url"],
+                repo.get("pushed_at"),
+                repo.get("size") or 0,
+            )
+
+        # The first response's Link header names the last page, so the
+        # remaining pages can be fetched concurrently instead of one by one.
+        last_page = 1
+        if "last" in response.links:
+            last_url = response.links["last"]["url"]
+            last_page = int(parse_qs(urlsplit(last_url).query)["page"][0])
+
+        if last_page > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+                page_futures = [
+                    executor.submit(
+                        _SESSION.get, url, params={**params, "page": p}, headers=headers
+                    )
+                    for p in range(2, last_page + 1)
+                ]
+                for page_future in concurrent.futures.as_completed(page_futures):
+                    page_response = page_future.result()
+                    page_response.raise_for_status()
+                    for repo in _decode_json(page_response):
+                        repo_dict[repo["name"]] = (
+                            repo["clone_url"],
+                            repo.get("pushed_at"),
+                            repo.get("size") or 0,
+                        )
+    except requests.exceptions.HTTPError as e:
+        print(f"Error retrieving repositories: {e}")
+        if e.response is not None:
+            print(f"Response text: {e.response.text}")
+        return None
+    except requests.exceptions.RequestException as e:
+        print(f"A network error occurred: {e}")
+        return None
+    return repo_dict
+
+
+_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# One cursor-paginated query carrying exactly the fields we use: 100 repos
+# per round-trip regardless of REST's per-page field bloat. The affiliations
+# match REST's /user/repos (owned, collaborator and organization repos) so
+# switching to GraphQL does not shrink the listed set — the deletion
+# reconcile would otherwise flag collaborator repos as gone upstream.
+_REPOS_QUERY = """
+query($login: String!, $cursor: String, $privacy: RepositoryPrivacy) {
+  repositoryOwner(login: $login) {
+    repositories(
+      first: 100, after: $cursor, privacy: $privacy,
+      ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes { name url pushedAt diskUsage }
+    }
+  }
+}
+"""
+
+
+def list_repos_graphql(
+    login: str, repo_type: str, token: str
+) -> Optional[Dict[str, Tuple[str, Optional[str], int]]]:
+    """
+    Lists repositories through the GraphQL API. Each request returns up to
+    100 repos with only name, url and pushedAt, cutting both round-trips
+    and rate-limit cost compared to REST pagination.
+
+    Args:
+        login (str): The GitHub user or organization login to list.
+        repo_type (str): The type of repositories to list (public, private, all).
+        token (str): The GitHub personal access token (required for GraphQL).
+
+    Returns:
+        dict: A dictionary mapping repo name to (clone url, pushed_at, size in
+        KB), or None if the GraphQL query failed (caller should fall back to
+        REST).
+    """
+    headers = {"Authorization": f"bearer {token}"}
+    privacy = {"public": "PUBLIC", "private": "PRIVATE"}.get(repo_type)
+
+    print(f"\n{repo_type.capitalize()} repositories for '{login}':")
+
+    repo_dict: Dict[str, Tuple[str, Optional[str], int]] = {}
+    cursor = None
     while True:
         try:
-            response = requests.get(f"{url}&page={page}", headers=headers)
-            response.raise_for_status()  # Raises an HTTPError for bad responses (4xx or 5xx)
-
-            repos = response.json()
-            if not repos:
-                break  # No more repos, exit the loop
-
-            for repo in repos:
-                repo_dict[repo["name"]] = repo["clone_url"]
-            page += 1
-        except requests.exceptions.HTTPError as e:
-            print(f"Error retrieving repositories: {e}")
-            print(f"Response text: {response.text}")
-            break
+            response = _SESSION.post(
+                _GRAPHQL_URL,
+                json={
+                    "query": _REPOS_QUERY,
+                    "variables": {
+                        "login": login,
+                        "cursor": cursor,
+                        "privacy": privacy,
+                    },
+                },
+                headers=headers,
+            )
+            response.raise_for_status()
+            payload = _decode_json(response)
         except requests.exceptions.RequestException as e:
-            print(f"A network error occurred: {e}")
+            print(f"GraphQL listing failed ({e}); falling back to REST.")
+            return None
+
+        if payload.get("errors") or not payload.get("data", {}).get(
+            "repositoryOwner"
+        ):
+            print("GraphQL listing returned errors; falling back to REST.")
+            return None
+
+        repositories = payload["data"]["repositoryOwner"]["repositories"]
+        for node in repositories["nodes"]:
+            repo_dict[node["name"]] = (
+                node["url"] + ".git",
+                node.get("pushedAt"),
+                node.get("diskUsage") or 0,
+            )
+
+        page_info = repositories["pageInfo"]
+        if not page_info["hasNextPage"]:
             break
+        cursor = page_info["endCursor"]
     return repo_dict
 
 
+def list_selected_repos(
+    names: list,
+    username: str,
+    token: Optional[str] = None,
+    org_name: Optional[str] = None,
+) -> Dict[str, Tuple[str, Optional[str], int]]:
+    """
+    Fetches metadata for an explicit list of repositories, skipping the full
+    account enumeration: one small GET per requested repo (issued in
+    parallel) instead of paging through everything the owner has.
+
+    Args:
+        names (list): The repository names to look up.
+        username (str): The GitHub username.
+        token (str, optional): The GitHub personal access token. Defaults to None.
+        org_name (str, optional): The GitHub organization name. Defaults to None.
+
+    Returns:
+        dict: A dictionary mapping repo name to (clone url, pushed_at, size in KB).
+    """
+    headers = {}
+    if token:
+        headers["Authorization"] = f"token {token}"
+    headers["Accept"] = "application/vnd.github.v3+json"
+
+    owner = org_name or username
+    repo_dict: Dict[str, Tuple[str, Optional[str], int]] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            executor.submit(
+                _SESSION.get,
+                f"https://api.github.com/repos/{owner}/{name}",
+                headers=headers,
+            ): name
+            for name in names
+        }
+        for future in concurrent.futures.as_completed(futures):
+            name = futures[future]
+            try:
+                response = future.result()
+                response.raise_for_status()
+                data = _decode_json(response)
+                repo_dict[data["name"]] = (
+                    data["clone_url"],
+                    data.get("pushed_at"),
+                    data.get("size") or 0,
+                )
+            except requests.exceptions.RequestException as e:
+                print(f"Error retrieving repository '{name}': {e}")
+    return repo_dict
+
+
+# Headroom required on the staging filesystem before we clone into it.
+_STAGING_MIN_FREE_BYTES = 256 * 1024 * 1024
+
+
+# How many trailing stderr lines to keep for error reporting.
+_STDERR_TAIL_LINES = 50
+
+
+def _remote_refs_unchanged(repo_path: str, clone_url: str) -> bool:
+    """
+    Returns True when every ref the remote advertises (branches, tags and
+    anything else under refs/) matches the local mirror's, i.e. a fetch
+    would be a no-op. Any failure (offline, empty repo) returns False so
+    the caller falls through to a normal fetch.
+    """
+    try:
+        out = subprocess.check_output(
+            ["git", "ls-remote", "origin"],
+            cwd=repo_path,
+            env=_git_env(clone_url),
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        remote_refs = {}
+        for line in out.splitlines():
+            sha, _, ref = line.partition("\t")
+            # Skip the symbolic HEAD and peeled tag entries (ref^{}): the
+            # mirror stores neither as a ref of its own.
+            if not ref or ref == "HEAD" or ref.endswith("^{}"):
+                continue
+            remote_refs[ref] = sha
+        local_out = subprocess.check_output(
+            ["git", "for-each-ref", "--format=%(objectname) %(refname)"],
+            cwd=repo_path,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        local_refs = {}
+        for line in local_out.splitlines():
+            sha, _, ref = line.partition(" ")
+            if ref:
+                local_refs[ref] = sha
+    except subprocess.CalledProcessError:
+        return False
+    return bool(remote_refs) and remote_refs == local_refs
+
+
+def _git_env(clone_url: str) -> Optional[dict]:
+    """
+    Returns the environment for git subprocesses handling the given URL.
+    For SSH clone URLs on POSIX systems, enables OpenSSH connection
+    multiplexing (ControlMaster) so every repo after the first reuses a
+    single SSH session per host instead of paying a handshake each.
+    Returns None (inherit the environment) for HTTPS URLs and on Windows,
+    where control sockets are unsupported.
+    """
+    if os.name == "nt" or clone_url.startswith("https://"):
+        return None
+    control_path = os.path.join(tempfile.gettempdir(), "sync-%C")
+    env = os.environ.copy()
+    env["GIT_SSH_COMMAND"] = (
+        "ssh -o ControlMaster=auto "
+        f"-o ControlPath={shlex.quote(control_path)} "
+        "-o ControlPersist=60s"
+    )
+    return env
+
+
+def _run_git(
+    cmd: list, cwd: Optional[str] = None, env: Optional[dict] = None
+) -> None:
+    """
+    Runs a git command, streaming its stderr instead of buffering it all:
+    progress output is discarded as it arrives and only a bounded tail is
+    retained for error reporting, so memory stays flat even when cloning
+    huge repositories.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    tail: deque = deque(maxlen=_STDERR_TAIL_LINES)
+    assert proc.stderr is not None
+    for line in proc.stderr:
+        tail.append(line)
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr="".join(tail))
+
+
+def _with_credentials(clone_url: str, userinfo: str) -> str:
+    """
+    Prefixes the URL's netloc with the precomputed (already URL-quoted)
+    userinfo. Non-HTTPS URLs are returned unchanged.
+    """
+    if not userinfo or not clone_url.startswith("https://"):
+        return clone_url
+    parts = urlsplit(clone_url)
+    return urlunsplit(parts._replace(netloc=userinfo + parts.netloc))
+
+
+def _remote_origin_url(repo_path: str) -> Optional[str]:
+    """
+    Reads remote.origin.url straight from the bare repository's config file,
+    avoiding a git subprocess. Git's config is INI-like but indents its keys,
+    so lines are dedented before parsing; interpolation is disabled because
+    stored URLs routinely contain % escapes from quoted credentials. Returns
+    None if the file is missing or unparsable.
+    """
+    cfg = configparser.ConfigParser(strict=False, interpolation=None)
+    try:
+        with open(os.path.join(repo_path, "config")) as f:
+            cfg.read_string("\n".join(line.strip() for line in f))
+        return cfg.get('remote "origin"', "url", fallback=None)
+    except (OSError, configparser.Error):
+        return None
+
+
+def _staging_path(repo_name: str, staging_dir: str) -> Optional[str]:
+    """
+    Returns a path under the staging directory to clone into, or None if the
+    staging filesystem is unusable or low on space. Staging on a RAM disk
+    (e.g. /dev/shm) avoids fsync stalls on the destination filesystem while
+    git writes and resolves the packfile.
+    """
+    try:
+        os.makedirs(staging_dir, exist_ok=True)
+        if shutil.disk_usage(staging_dir).free < _STAGING_MIN_FREE_BYTES:
+            return None
+    except OSError:
+        return None
+    return os.path.join(staging_dir, repo_name + ".git")
+
+
+def _mirror_remote(repo, name, url):
+    """
+    Remote-creation callback for pygit2.clone_repository: creates origin with
+    a mirror refspec so the initial fetch already transfers every ref, like
+    `git clone --mirror`, instead of a heads-only snapshot that only becomes
+    a full mirror on the next fetch.
+    """
+    return repo.remotes.create(name, url, "+refs/*:refs/*")
+
+
+def _sync_one_pygit2(
+    repo_name: str,
+    clone_url: str,
+    repo_path: str,
+    token: Optional[str],
+    staging_dir: Optional[str] = None,
+) -> str:
+    """
+    In-process variant of _sync_one using libgit2 via pygit2. Avoids the
+    fork+exec and process startup cost of a git subprocess per repository.
+
+    Args:
+        repo_name (str): The repository name.
+        clone_url (str): The repository clone URL (without embedded token).
+        repo_path (str): The local path of the bare repository.
+        token (str, optional): The GitHub personal access token.
+
+    Returns:
+        str: A status message describing what was done.
+    """
+    callbacks = None
+    if token:
+        callbacks = pygit2.RemoteCallbacks(
+            credentials=pygit2.UserPass("x-access-token", token)
+        )
+
+    if os.path.exists(repo_path):
+        repo = pygit2.Repository(repo_path)
+        if repo.remotes["origin"].url != clone_url:
+            repo.remotes.set_url("origin", clone_url)
+        repo.remotes["origin"].fetch(
+            refspecs=["+refs/*:refs/*"],
+            callbacks=callbacks,
+            prune=pygit2.GIT_FETCH_PRUNE,
+        )
+        return f"Fetched updates for '{repo_name}'."
+    else:
+        dest = repo_path
+        if staging_dir:
+            dest = _staging_path(repo_name, staging_dir) or repo_path
+        try:
+            repo = pygit2.clone_repository(
+                clone_url, dest, bare=True, remote=_mirror_remote, callbacks=callbacks
+            )
+            # Match `git clone --mirror` for future fetches too.
+            repo.config["remote.origin.mirror"] = True
+            repo.config["remote.origin.fetch"] = "+refs/*:refs/*"
+        except Exception:
+            if dest != repo_path:
+                shutil.rmtree(dest, ignore_errors=True)
+            raise
+        if dest != repo_path:
+            shutil.move(dest, repo_path)
+        return f"Mirror cloned '{repo_name}' into '{repo_path}'."
+
+
+def _sync_one(
+    repo_name: str,
+    clone_url: str,
+    folder: str,
+    token: Optional[str],
+    userinfo: str = "",
+    partial: bool = False,
+    staging_dir: Optional[str] = None,
+) -> Tuple[str, bool]:
+    """
+    Mirror clones a single repository, or fetches updates if it already exists.
+    Uses libgit2 in-process when pygit2 is installed; otherwise falls back to
+    git subprocesses. Git output is captured so that concurrent workers do not
+    interleave on the terminal.
+
+    Args:
+        repo_name (str): The repository name.
+        clone_url (str): The repository clone URL.
+        folder (str): The local folder to save the repository.
+        token (str, optional): The GitHub personal access token.
+        userinfo (str): Pre-quoted "token@" prefix to inject into HTTPS URLs.
+        partial (bool): If True, clone with --filter=blob:none so historical
+            blobs are fetched on demand instead of up front.
+        staging_dir (str, optional): Stage first-time clones here (e.g. a
+            tmpfs path) and move them into place on success.
+
+    Returns:
+        tuple: A status message and whether the repository was actually
+        cloned/fetched (False when the heads pre-check skipped the fetch).
+    """
+    # Partial clones need the git CLI (libgit2 has no promisor support), and
+    # so do SSH URLs: the pygit2 path only carries HTTPS credentials, and the
+    # ControlMaster multiplexing in _git_env covers subprocesses only.
+    if pygit2 is not None and not partial and clone_url.startswith("https://"):
+        repo_path = os.path.join(folder, repo_name + ".git")
+        return (
+            _sync_one_pygit2(repo_name, clone_url, repo_path, token, staging_dir),
+            True,
+        )
+
+    clone_url = _with_credentials(clone_url, userinfo)
+    repo_path = os.path.join(folder, repo_name + ".git")
+
+    if os.path.exists(repo_path):
+        if token:
+            # Check if the remote URL needs to be updated with the token;
+            # only spawn git when it actually needs changing.
+            remote_url = _remote_origin_url(repo_path)
+            if remote_url != clone_url:
+                subprocess.run(
+                    ["git", "remote", "set-url", "origin", clone_url],
+                    cwd=repo_path,
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+        # Cheap pre-check: a single ls-remote round-trip (refs only, no
+        # packfile) instead of a full fetch negotiation when no advertised
+        # ref has moved. The skip is still reported as not-fetched so the
+        # fresh pushed_at is never cached for a run that didn't fetch, and
+        # the pre-check simply runs again next time.
+        if _remote_refs_unchanged(repo_path, clone_url):
+            return f"'{repo_name}' already up to date (remote refs unchanged).", False
+
+        # Fetch only origin instead of --all, and advertise just our branch
+        # tips during negotiation so the server computes a minimal delta.
+        fetch_cmd = [
+            "git",
+            *_GIT_THREAD_OPTS,
+            "fetch",
+            "--prune",
+            "--negotiation-tip=refs/heads/*",
+        ]
+        if partial:
+            fetch_cmd.append("--filter=blob:none")
+        fetch_cmd.append("origin")
+        _run_git(fetch_cmd, cwd=repo_path, env=_git_env(clone_url))
+        return f"Fetched updates for '{repo_name}'.", True
+    else:
+        dest = repo_path
+        if staging_dir:
+            dest = _staging_path(repo_name, staging_dir) or repo_path
+        clone_cmd = ["git", *_GIT_THREAD_OPTS, "clone", "--mirror"]
+        if partial:
+            # git records remote.origin.promisor/partialclonefilter itself,
+            # so later fetches stay partial without extra configuration.
+            clone_cmd.append("--filter=blob:none")
+        clone_cmd += [clone_url, dest]
+        try:
+            _run_git(clone_cmd, env=_git_env(clone_url))
+        except subprocess.CalledProcessError:
+            if dest != repo_path:
+                shutil.rmtree(dest, ignore_errors=True)
+            raise
+        if dest != repo_path:
+            shutil.move(dest, repo_path)
+        return f"Mirror cloned '{repo_name}' into '{repo_path}'.", True
+
+
 def mirror_repos(
-    repos: Dict[str, str], folder: str, token: Optional[str] = None
+    repos: Dict[str, Tuple[str, Optional[str], int]],
+    folder: str,
+    token: Optional[str] = None,
+    jobs: int = 1,
+    state: Optional[dict] = None,
+    partial: bool = False,
+    staging_dir: Optional[str] = None,
 ) -> None:
     """
     Mirror clones the given repositories into the specified folder.
-    If the repository already exists, it fetches all the changes.
+    If the repository already exists, it fetches all the changes, unless its
+    pushed_at timestamp matches the cached one from the previous run, in
+    which case the fetch is skipped entirely.
+    Repositories are processed concurrently by a thread pool, since the
+    per-repo work is almost entirely network/disk bound inside git.
 
     Args:
-        repos (dict): A dictionary of repository names and their clone URLs.
+        repos (dict): A dictionary mapping repo name to (clone url, pushed_at,
+            size in KB).
         folder (str): The local folder to save the repositories.
         token (str, optional): The GitHub personal access token. Defaults to None.
+        jobs (int): The number of repositories to process in parallel.
+        state (dict, optional): Sync state from a previous run; updated in place.
+        partial (bool): If True, new clones use --filter=blob:none.
+        staging_dir (str, optional): Stage first-time clones here (e.g. a
+            tmpfs path) and move them into place on success.
     """
     if not os.path.exists(folder):
         os.makedirs(folder)
 
-    for repo_name, clone_url in repos.items():
-        try:
-            print(f"\nProcessing '{repo_name}'...")
-            if token:
-                clone_url = clone_url.replace("https://", f"https://{token}@")
-            repo_path = os.path.join(folder, repo_name + ".git")
+    cached_repos = state.get("repos", {}) if state else {}
 
-            if os.path.exists(repo_path):
-                print(
-                    f"Repository already exists. Fetching updates for '{repo_name}'..."
+    # Quote the token once up front; tokens with reserved characters would
+    # otherwise produce an invalid URL and a failed auth on every repo.
+    userinfo = f"{quote(token, safe='')}@" if token else ""
+
+    # Submit largest repositories first (longest-processing-time-first):
+    # total wall time is bounded by when the biggest clone starts, so it must
+    # not end up queued behind a batch of small ones.
+    ordered = sorted(repos.items(), key=lambda item: item[1][2], reverse=True)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        for repo_name, (clone_url, pushed_at, _size) in ordered:
+            repo_path = os.path.join(folder, repo_name + ".git")
+            if (
+                pushed_at
+                and os.path.exists(repo_path)
+                and cached_repos.get(repo_name, {}).get("pushed_at") == pushed_at
+            ):
+                print(f"\n'{repo_name}' unchanged since last sync. Skipping.")
+                continue
+            futures[
+                executor.submit(
+                    _sync_one,
+                    repo_name,
+                    clone_url,
+                    folder,
+                    token,
+                    userinfo,
+                    partial,
+                    staging_dir,
                 )
-                if token:
-                    # Check if the remote URL needs to be updated with the token
-                    remote_url = subprocess.check_output(
-                        ["git", "config", "--get", "remote.origin.url"],
-                        cwd=repo_path,
-                        text=True,
-                    ).strip()
-                    if token not in remote_url:
-                        print("Updating remote URL with token.")
-                        subprocess.run(
-                            ["git", "remote", "set-url", "origin", clone_url],
-                            cwd=repo_path,
-                            check=True,
-                            text=True,
-                        )
-                subprocess.run(
-                    [
-                        "git",
-                        "fetch",
-                        "--all",
-                        "--prune",
-                        "--progress",
-                    ],
-                    cwd=repo_path,
-                    check=True,
-                    text=True,
+            ] = repo_name
+        failures = 0
+        for future in concurrent.futures.as_completed(futures):
+            repo_name = futures[future]
+            try:
+                message, fetched = future.result()
+                print(f"\n{message}")
+                # Only a real clone/fetch earns the fresh timestamp: a
+                # skipped repo stays retryable instead of being recorded
+                # as synced.
+                if state is not None and fetched:
+                    clone_url, pushed_at, size = repos[repo_name]
+                    state.setdefault("repos", {})[repo_name] = {
+                        "clone_url": clone_url,
+                        "pushed_at": pushed_at,
+                        "size": size,
+                    }
+            except subprocess.CalledProcessError as e:
+                failures += 1
+                print(
+                    f"  ERROR: Failed to process repository '{repo_name}'. Git command failed."
                 )
-            else:
-                print(f"Mirror cloning '{repo_name}' into '{repo_path}'...")
-                subprocess.run(
-                    ["git", "clone", "--mirror", "--progress", clone_url, repo_path],
-                    check=True,
-                    text=True,
+                if e.stderr:
+                    print(f"  {e.stderr.strip()}")
+            except FileNotFoundError:
+                failures += 1
+                print(
+                    "  ERROR: 'git' command not found. Is Git installed and in your PATH?"
                 )
-        except subprocess.CalledProcessError:
-            print(
-                f"  ERROR: Failed to process repository '{repo_name}'. Git command failed. See output above for details."
-            )
-        except FileNotFoundError:
-            print(
-                "  ERROR: 'git' command not found. Is Git installed and in your PATH?"
-            )
-            break  # Stop if git is not installed
+            except _GIT_ERRORS as e:
+                failures += 1
+                print(f"  ERROR: Failed to process repository '{repo_name}': {e}")
+
+    if failures and state is not None:
+        # A failed repo never makes it into state["repos"], and a 304 on the
+        # next run would serve the cached list without it. Drop the listing
+        # validators so the next run re-enumerates and retries.
+        state.pop("listing", None)
 
 
 if __name__ == "__main__":
@@ -190,6 +813,34 @@ if __name__ == "__main__":
         action="store_true",
         help="Force syncing for the user, ignoring any GH_ORG set in the environment.",
     )
+    parser.add_argument(
+        "--jobs",
+        default=min(8, (os.cpu_count() or 1) * 2),
+        help="Number of repositories to clone/fetch in parallel.",
+        type=int,
+    )
+    parser.add_argument(
+        "--partial",
+        action="store_true",
+        help="Clone with --filter=blob:none (blobs fetched on demand). Note that commands like 'git log -p' in the mirror will trigger on-demand blob fetches.",
+    )
+    parser.add_argument(
+        "--staging-dir",
+        default=None,
+        help="Stage first-time clones in this directory (e.g. /dev/shm/ghsync) and move them into the target folder on success.",
+        type=str,
+    )
+    parser.add_argument(
+        "--prune-deleted",
+        action="store_true",
+        help="Remove local mirrors of repositories that no longer exist upstream.",
+    )
+    parser.add_argument(
+        "--repos",
+        default=None,
+        help="Comma-separated repository names to sync, skipping the full account listing.",
+        type=str,
+    )
 
     args = parser.parse_args()
 
@@ -203,16 +854,77 @@ if __name__ == "__main__":
             "Username must be provided either as an argument or in the .env file as GH_USERNAME"
         )
 
-    repos = list_repos(args.username, args.repo_type, args.token, args.org)
-
     if args.org:
         target_folder = f"{args.folder}_{args.org}"
     else:
         target_folder = f"{args.folder}_{args.username}"
 
+    state = _load_state(target_folder)
+    if args.repos:
+        names = [name.strip() for name in args.repos.split(",") if name.strip()]
+        repos = list_selected_repos(names, args.username, args.token, args.org)
+    else:
+        # Prefer GraphQL when authenticated (fewer, smaller requests);
+        # fall back to the REST listing otherwise or on failure.
+        repos = None
+        if args.token:
+            repos = list_repos_graphql(
+                args.org or args.username, args.repo_type, args.token
+            )
+        if repos is None:
+            repos = list_repos(
+                args.username, args.repo_type, args.token, args.org, state
+            )
+
+    if repos is None:
+        # The listing failed outright; without a complete repo set, neither
+        # the deletion reconcile below nor a sync can run safely.
+        raise SystemExit(1)
+
     print(f"{len(repos)} github_repos found.")
+
+    # Reconcile against the previous run: anything in the state but absent
+    # from the fresh listing was deleted (or renamed) upstream. Only a full
+    # listing may drive deletions: a --repos subset or a public/private
+    # repo_type filter lists less than the state may hold, and so does an
+    # unauthenticated run (public repos only) against a state populated with
+    # a token — hence the recorded scope must match too.
+    scope = {"owner": args.org or args.username, "authenticated": bool(args.token)}
+    full_listing = not args.repos and args.repo_type == "all"
+    if full_listing and state.get("scope") == scope:
+        deleted = set(state.get("repos", {})) - set(repos)
+    else:
+        deleted = set()
+    if full_listing:
+        state["scope"] = scope
+    if deleted:
+        if args.prune_deleted:
+            for repo_name in sorted(deleted):
+                shutil.rmtree(
+                    os.path.join(target_folder, repo_name + ".git"),
+                    ignore_errors=True,
+                )
+                state["repos"].pop(repo_name, None)
+                print(f"Pruned deleted repository '{repo_name}'.")
+            _save_state(target_folder, state)
+        else:
+            print(
+                f"{len(deleted)} mirrored repositories no longer exist upstream "
+                "(re-run with --prune-deleted to remove them): "
+                + ", ".join(sorted(deleted))
+            )
+
     if repos:
-        mirror_repos(repos, target_folder, args.token)
+        mirror_repos(
+            repos,
+            target_folder,
+            args.token,
+            args.jobs,
+            state,
+            args.partial,
+            args.staging_dir,
+        )
+        _save_state(target_folder, state)
 
 # example .env
 # GH_USERNAME=username